@@ -1,6 +1,7 @@
 """Configuration management for the API"""
 import os
 from typing import Optional
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -25,10 +26,22 @@ class Settings(BaseSettings):
     # Security
     secret_key: str = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
     api_key_enabled: bool = os.getenv("API_KEY_ENABLED", "false").lower() == "true"
-    api_keys: list = os.getenv("API_KEYS", "test-api-key-123").split(",")
-    
+    # default_factory keeps the env read lazy (evaluated when Settings is
+    # instantiated, not at class-definition time) and avoids sharing one
+    # mutable list across instances
+    api_keys: list = Field(default_factory=lambda: os.getenv("API_KEYS", "test-api-key-123").split(","))
+    # Derived from api_keys on the auth hot path, pre-encoded for
+    # hmac.compare_digest: it raises TypeError on non-ASCII str input,
+    # while comparing bytes on both sides never does
+    api_keys_bytes: frozenset = frozenset()
+
+    @model_validator(mode="after")
+    def _build_api_key_set(self):
+        self.api_keys_bytes = frozenset(key.encode() for key in self.api_keys)
+        return self
+
     # CORS
-    cors_origins: list = ["*"]  # Configure appropriately for production
+    cors_origins: list = Field(default_factory=lambda: ["*"])  # Configure appropriately for production
     
     # Rate Limiting
     rate_limit_enabled: bool = True
@@ -39,7 +52,12 @@ class Settings(BaseSettings):
     cache_enabled: bool = False  # Set to True if Redis is available
     redis_url: Optional[str] = os.getenv("REDIS_URL", None)
     cache_ttl: int = 300  # seconds
+    query_cache_size: int = 256  # Max entries in the in-process result cache
+    query_cache_ttl: int = 300  # seconds
     
+    # Create missing lookup indexes at startup (requires write privileges)
+    create_indexes: bool = False
+
     # Query Limits
     max_query_limit: int = 1000
     default_query_limit: int = 100
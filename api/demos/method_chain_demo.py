@@ -8,13 +8,25 @@ method chains like '.find.with_organizations.upstream' into Cypher queries.
 Perfect for integration into systems that need programmatic Cypher generation!
 """
 
+import asyncio
+import io
+import sys
+
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 import json
 from typing import Dict, Any
 
-# API Configuration  
+# API Configuration
 API_BASE = "http://localhost:8001"
 
+# Shared session: urllib3's pool keeps the keep-alive socket open across the
+# demo's calls instead of paying a fresh TCP handshake per request
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+SESSION.headers.update({"Content-Type": "application/json"})
+
 # Colors for terminal output
 class Colors:
     BLUE = '\033[94m'
@@ -24,31 +36,43 @@ class Colors:
     END = '\033[0m'
     BOLD = '\033[1m'
 
-def print_header(title: str):
-    """Print a formatted header"""
-    print(f"\n{Colors.BOLD}{Colors.BLUE}{'='*60}{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{title.center(60)}{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{'='*60}{Colors.END}\n")
+# Formatting helpers return strings so callers can batch everything for an
+# example into one buffered stdout write instead of flushing per line.
+# The colored templates are concatenated once at import; each call is a
+# single %-format instead of rebuilding the ANSI framing
+
+_HRULE = f"{Colors.BOLD}{Colors.BLUE}{'='*60}{Colors.END}"
+_HEADER_FMT = f"\n{_HRULE}\n{Colors.BOLD}{Colors.BLUE}%s{Colors.END}\n{_HRULE}\n\n"
+_SUCCESS_FMT = f"{Colors.GREEN}✅ %s{Colors.END}"
+_INFO_FMT = f"{Colors.YELLOW}ℹ️  %s{Colors.END}"
 
-def print_success(message: str):
-    """Print success message"""
-    print(f"{Colors.GREEN}✅ {message}{Colors.END}")
+def fmt_header(title: str) -> str:
+    """Format a section header"""
+    return _HEADER_FMT % title.center(60)
 
-def print_info(message: str):
-    """Print info message"""
-    print(f"{Colors.YELLOW}ℹ️  {message}{Colors.END}")
+def fmt_success(message: str) -> str:
+    """Format a success message"""
+    return _SUCCESS_FMT % message
 
-def print_cypher(cypher: str, params: Dict[str, Any] = None):
-    """Print Cypher query with syntax highlighting"""
-    print(f"{Colors.BOLD}📝 Generated Cypher:{Colors.END}")
-    print(f"{Colors.BLUE}{cypher}{Colors.END}")
+def fmt_info(message: str) -> str:
+    """Format an info message"""
+    return _INFO_FMT % message
+
+def fmt_cypher(cypher: str, params: Dict[str, Any] = None) -> str:
+    """Format a Cypher query with syntax highlighting"""
+    lines = [
+        f"{Colors.BOLD}📝 Generated Cypher:{Colors.END}",
+        f"{Colors.BLUE}{cypher}{Colors.END}"
+    ]
     if params:
-        print(f"{Colors.BOLD}🔧 Parameters:{Colors.END}")
-        print(f"{Colors.YELLOW}{json.dumps(params, indent=2)}{Colors.END}")
+        lines.append(f"{Colors.BOLD}🔧 Parameters:{Colors.END}")
+        lines.append(f"{Colors.YELLOW}{json.dumps(params, indent=2)}{Colors.END}")
+    return "\n".join(lines)
 
-def demo_method_chains():
-    """Demo various method chain translations"""
-    print_header("Method Chain Translation Examples")
+async def demo_method_chains():
+    """Demo various method chain translations (requests issued concurrently)"""
+    buf = io.StringIO()
+    buf.write(fmt_header("Method Chain Translation Examples"))
     
     examples = [
         {
@@ -89,70 +113,86 @@ def demo_method_chains():
         }
     ]
     
-    for example in examples:
-        print(f"{Colors.BOLD}📌 {example['name']}{Colors.END}")
-        print(f"   Description: {example['description']}")
-        print(f"   Chain: {Colors.YELLOW}{example['chain']}{Colors.END}")
-        print(f"   Parameters: {json.dumps(example['params'])}")
-        
-        try:
-            response = requests.post(
-                f"{API_BASE}/api/v1/translate/method-chain",
+    # Fire all example translations concurrently over one pooled connection:
+    # total wall time is ~one round trip instead of one per example
+    async with httpx.AsyncClient(
+        base_url=API_BASE,
+        limits=httpx.Limits(max_keepalive_connections=8)
+    ) as client:
+        coros = [
+            client.post(
+                "/api/v1/translate/method-chain",
                 json={
                     "method_chain": example["chain"],
                     "parameters": example["params"]
-                },
-                headers={"Content-Type": "application/json"}
+                }
             )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data["success"]:
-                    print_success(f"Translation: {data.get('method_chain', 'N/A')}")
-                    print_cypher(data["cypher"], data.get("parameters"))
-                    if data.get("explanation"):
-                        print(f"   💡 {data['explanation']}")
-                else:
-                    print(f"   ❌ {data.get('error', 'Translation failed')}")
+            for example in examples
+        ]
+        responses = await asyncio.gather(*coros, return_exceptions=True)
+
+    # Format serially so the output keeps the example order, then emit the
+    # whole report in one write rather than one flush per line
+    for example, response in zip(examples, responses):
+        buf.write(f"{Colors.BOLD}📌 {example['name']}{Colors.END}\n")
+        buf.write(f"   Description: {example['description']}\n")
+        buf.write(f"   Chain: {Colors.YELLOW}{example['chain']}{Colors.END}\n")
+        buf.write(f"   Parameters: {json.dumps(example['params'])}\n")
+
+        if isinstance(response, Exception):
+            buf.write(f"   ❌ Error: {response}\n")
+        elif response.status_code == 200:
+            data = response.json()
+            if data["success"]:
+                buf.write(fmt_success(f"Translation: {data.get('method_chain', 'N/A')}") + "\n")
+                buf.write(fmt_cypher(data["cypher"], data.get("parameters")) + "\n")
+                if data.get("explanation"):
+                    buf.write(f"   💡 {data['explanation']}\n")
             else:
-                print(f"   ❌ HTTP {response.status_code}: {response.text[:100]}")
-                
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-            
-        print("-" * 60)
+                buf.write(f"   ❌ {data.get('error', 'Translation failed')}\n")
+        else:
+            buf.write(f"   ❌ HTTP {response.status_code}: {response.text[:100]}\n")
+
+        buf.write("-" * 60 + "\n")
+
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
 
 def demo_available_methods():
     """Show available methods"""
-    print_header("Available Methods for Chaining")
-    
+    buf = io.StringIO()
+    buf.write(fmt_header("Available Methods for Chaining"))
+
     try:
-        response = requests.get(f"{API_BASE}/api/v1/translate/help")
-        
+        response = SESSION.get(f"{API_BASE}/api/v1/translate/help")
+
         if response.status_code == 200:
             data = response.json()
-            
+
             methods = data.get("available_methods", {})
-            
+
             for method_name, info in methods.items():
-                print(f"\n{Colors.BOLD}.{method_name}{Colors.END}")
-                print(f"  📝 {info['description']}")
-                print(f"  🔧 Parameters: {Colors.YELLOW}{', '.join(info['parameters']) if info['parameters'] else 'none'}{Colors.END}")
-                print(f"  💡 Example: {Colors.BLUE}{info['example']}{Colors.END}")
-                
+                buf.write(f"\n{Colors.BOLD}.{method_name}{Colors.END}\n")
+                buf.write(f"  📝 {info['description']}\n")
+                buf.write(f"  🔧 Parameters: {Colors.YELLOW}{', '.join(info['parameters']) if info['parameters'] else 'none'}{Colors.END}\n")
+                buf.write(f"  💡 Example: {Colors.BLUE}{info['example']}{Colors.END}\n")
+
         else:
-            print(f"❌ Failed to get help: HTTP {response.status_code}")
-            
+            buf.write(f"❌ Failed to get help: HTTP {response.status_code}\n")
+
     except Exception as e:
-        print(f"❌ Error getting help: {e}")
+        buf.write(f"❌ Error getting help: {e}\n")
+
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
 
 def demo_integration_pattern():
     """Show integration pattern for web servers"""
-    print_header("Web Server Integration Pattern")
-    
-    print_info("Your colleague can integrate this API easily:")
-    print()
-    
+    buf = io.StringIO()
+    buf.write(fmt_header("Web Server Integration Pattern"))
+    buf.write(fmt_info("Your colleague can integrate this API easily:") + "\n\n")
+
+
     integration_code = '''// JavaScript/Node.js Example
 async function translateMethodChain(chain, params) {
     const response = await fetch('http://your-api-host:8001/api/v1/translate/method-chain', {
@@ -180,18 +220,24 @@ async function translateMethodChain(chain, params) {
 // Usage example
 const cypher = await translateMethodChain('.find.with_organizations', {asn: 15169});'''
     
-    print(f"{Colors.BLUE}{integration_code}{Colors.END}")
-    
-    print()
-    print_success("Benefits of this approach:")
-    print("  ✓ No need to understand Cypher query language")
-    print("  ✓ Consistent, optimized query generation")
-    print("  ✓ Parameters are properly escaped (injection safe)")
-    print("  ✓ Easy to chain complex operations")
-    print("  ✓ Get explanations of what each query does")
+    buf.write(f"{Colors.BLUE}{integration_code}{Colors.END}\n\n")
+    buf.write(fmt_success("Benefits of this approach:") + "\n")
+    buf.write("  ✓ No need to understand Cypher query language\n")
+    buf.write("  ✓ Consistent, optimized query generation\n")
+    buf.write("  ✓ Parameters are properly escaped (injection safe)\n")
+    buf.write("  ✓ Easy to chain complex operations\n")
+    buf.write("  ✓ Get explanations of what each query does\n")
+
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
 
 def main():
     """Run method chain translation demo"""
+    # Defer flushing to the explicit per-section writes; over a remote TTY
+    # each flush is a network round trip
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False)
+
     print(f"{Colors.BOLD}{Colors.BLUE}")
     print("🔄 IYP Method Chain Translation API")
     print("====================================")
@@ -200,36 +246,39 @@ def main():
     
     # Check if API is available
     try:
-        response = requests.get(f"{API_BASE}/api/v1/health", timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("database_connected"):
-                print_success("API is running and database is connected!")
+        try:
+            response = SESSION.get(f"{API_BASE}/api/v1/health", timeout=5)
+            if response.status_code == 200:
+                data = response.json()
+                if data.get("database_connected"):
+                    print(fmt_success("API is running and database is connected!"))
+                else:
+                    print("⚠️  API is running but database is not connected")
             else:
-                print("⚠️  API is running but database is not connected")
-        else:
-            print(f"❌ API health check failed: {response.status_code}")
+                print(f"❌ API health check failed: {response.status_code}")
+                return
+        except Exception as e:
+            print(f"❌ Cannot connect to API: {e}")
+            print(fmt_info("Make sure the server is running: cd api && python -m uvicorn main:app --port 8001"))
             return
-    except Exception as e:
-        print(f"❌ Cannot connect to API: {e}")
-        print_info("Make sure the server is running: cd api && python -m uvicorn main:app --port 8001")
-        return
-    
-    # Run demonstrations
-    demo_method_chains()
-    demo_available_methods()
-    demo_integration_pattern()
-    
-    print_header("Method Chain API Ready!")
-    print_success("🎯 Perfect for programmatic Cypher generation!")
-    print()
-    print(f"{Colors.BOLD}📍 Key Endpoints:{Colors.END}")
-    print(f"  POST /api/v1/translate/method-chain - Translate method chains")
-    print(f"  GET  /api/v1/translate/help - Get available methods")
-    print(f"  GET  /api/v1/translate/examples - Get example translations")
-    print()
-    print(f"🌐 Interactive test interface: {API_BASE}/")
-    print(f"📚 API documentation: {API_BASE}/docs")
+
+        # Run demonstrations
+        asyncio.run(demo_method_chains())
+        demo_available_methods()
+        demo_integration_pattern()
+
+        print(fmt_header("Method Chain API Ready!"), end="")
+        print(fmt_success("🎯 Perfect for programmatic Cypher generation!"))
+        print()
+        print(f"{Colors.BOLD}📍 Key Endpoints:{Colors.END}")
+        print(f"  POST /api/v1/translate/method-chain - Translate method chains")
+        print(f"  GET  /api/v1/translate/help - Get available methods")
+        print(f"  GET  /api/v1/translate/examples - Get example translations")
+        print()
+        print(f"🌐 Interactive test interface: {API_BASE}/")
+        print(f"📚 API documentation: {API_BASE}/docs")
+    finally:
+        SESSION.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,11 +1,17 @@
 """Main FastAPI application"""
-from fastapi import FastAPI, Request
+import hashlib
+import json
+import re
+import time
+from pathlib import Path
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
+from slowapi.middleware import SlowAPIMiddleware
 import uvicorn
 
 from config import settings
@@ -17,7 +23,10 @@ app = FastAPI(
     description=settings.api_description,
     version=settings.api_version,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    # Query responses can carry thousands of Neo4j records; orjson encodes
+    # dict/list payloads several times faster than stdlib json
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -30,46 +39,143 @@ app.add_middleware(
 )
 
 # Add rate limiting
+def _rate_limit_key(request: Request) -> str:
+    """Client IP straight from the ASGI scope.
+
+    Cheaper than get_remote_address, which inspects proxy headers on every
+    request; there is no trusted proxy in front of this service.
+    """
+    client = request.scope.get("client")
+    return client[0] if client else "0.0.0.0"
+
 if settings.rate_limit_enabled:
-    limiter = Limiter(key_func=get_remote_address)
+    limiter = Limiter(
+        key_func=_rate_limit_key,
+        default_limits=[f"{settings.rate_limit_requests}/{settings.rate_limit_period} second"],
+        storage_uri="memory://",
+        strategy="moving-window"
+    )
     app.state.limiter = limiter
+    # default_limits are only enforced through the middleware (or per-route
+    # decorators); without it the limiter is configured but never consulted
+    app.add_middleware(SlowAPIMiddleware)
     app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+@app.middleware("http")
+async def add_server_timing(request: Request, call_next):
+    """Attach a Server-Timing header with the app-side handling duration.
+
+    perf_counter_ns is monotonic (immune to NTP slews) and integer-based,
+    so the subtraction costs nothing and never goes backwards.
+    """
+    t0 = time.perf_counter_ns()
+    response = await call_next(request)
+    elapsed_ms = (time.perf_counter_ns() - t0) / 1e6
+    response.headers["Server-Timing"] = f"app;dur={elapsed_ms:.2f}"
+    return response
+
 # Include routers
 app.include_router(translation.router)  # Primary translation service
 app.include_router(query.router)
 app.include_router(search.router)
 app.include_router(admin.router)
 
+# Static assets: content-hashed filenames can be cached forever, everything
+# else revalidates after a minute (Starlette already emits ETags, so warm
+# clients get 304s either way)
+_HASHED_ASSET_RE = re.compile(r"\.[0-9a-f]{8,}\.(js|css|png|svg)$")
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that sets Cache-Control based on whether the name is hashed"""
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if _HASHED_ASSET_RE.search(str(full_path)):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["Cache-Control"] = "public, max-age=60"
+        return response
+
 # Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", CachedStaticFiles(directory="static"), name="static")
+
+# The landing page is static, so keep it in memory instead of re-reading
+# the file (and blocking the event loop) on every hit
+_INDEX_FALLBACK = "<h1>IYP Query API</h1><p>Test website not found. <a href='/docs'>View API Documentation</a></p>"
+_INDEX_HTML = _INDEX_FALLBACK
+
+def _etag_for(content: str) -> str:
+    return f'"{hashlib.blake2b(content.encode(), digest_size=8).hexdigest()}"'
+
+_INDEX_ETAG = _etag_for(_INDEX_HTML)
+
+@app.on_event("startup")
+async def verify_database_connection():
+    """Fail startup if Neo4j is unreachable.
+
+    Crashing the process lets the supervisor (systemd, k8s, docker) restart
+    it, instead of the API serving guaranteed-failing traffic that burns a
+    DB connection attempt plus exception formatting on every request.
+    """
+    from services.query_service import query_service
+    if query_service.iyp is None and not query_service.connect_to_database():
+        raise RuntimeError(f"Could not connect to Neo4j at {settings.neo4j_uri}")
+
+@app.on_event("startup")
+async def load_index_html():
+    """Read the test website into memory once"""
+    global _INDEX_HTML, _INDEX_ETAG
+    try:
+        _INDEX_HTML = Path("static/index.html").read_text()
+    except FileNotFoundError:
+        _INDEX_HTML = _INDEX_FALLBACK
+    _INDEX_ETAG = _etag_for(_INDEX_HTML)
+
+@app.on_event("startup")
+async def warm_translation_examples():
+    """Translate and serialize the canonical examples once.
+
+    This both warms the translation memo and lets /translate/examples serve
+    pre-encoded bytes instead of re-translating six chains per hit.
+    """
+    import orjson
+    from services.translation_service import translation_service
+    payload = orjson.dumps(translation_service.get_common_examples())
+    # Only keep a fully successful build; otherwise the examples endpoint
+    # retries the translations on demand instead of serving frozen errors
+    if translation_service.examples_ready():
+        app.state.examples_bytes = payload
 
 # Root endpoint
 @app.get("/", response_class=HTMLResponse)
-async def root():
+async def root(request: Request):
     """Serve the test website"""
-    try:
-        with open("static/index.html", "r") as f:
-            return HTMLResponse(content=f.read())
-    except FileNotFoundError:
-        return HTMLResponse(content="<h1>IYP Query API</h1><p>Test website not found. <a href='/docs'>View API Documentation</a></p>")
+    headers = {"ETag": _INDEX_ETAG, "Cache-Control": "public, max-age=300"}
+    if request.headers.get("if-none-match") == _INDEX_ETAG:
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=_INDEX_HTML, headers=headers)
+
+# API documentation endpoint; the payload is static, so serialize it once
+_API_ROOT_BYTES = json.dumps({
+    "message": "IYP Query API",
+    "version": settings.api_version,
+    "docs": "/docs",
+    "test_ui": "/"
+}).encode()
 
-# API documentation endpoint
 @app.get("/api")
 async def api_root():
     """API root endpoint"""
-    return {
-        "message": "IYP Query API",
-        "version": settings.api_version,
-        "docs": "/docs",
-        "test_ui": "/"
-    }
+    return Response(content=_API_ROOT_BYTES, media_type="application/json")
 
 if __name__ == "__main__":
-    # Run the application
+    # Run the application. Keep-alive is held well past uvicorn's 5s default
+    # so polling clients and the demo reuse one TCP connection instead of
+    # re-handshaking between calls
     uvicorn.run(
         "main:app",
         host=settings.host,
         port=settings.port,
-        reload=settings.reload
+        reload=settings.reload,
+        timeout_keep_alive=75
     )
\ No newline at end of file
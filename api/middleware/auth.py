@@ -1,4 +1,6 @@
 """Authentication middleware"""
+import hmac
+
 from fastapi import HTTPException, Security, status
 from fastapi.security import APIKeyHeader
 from config import settings
@@ -16,7 +18,11 @@ async def verify_api_key(api_key: str = Security(api_key_header)):
             detail="API key required"
         )
     
-    if api_key not in settings.api_keys:
+    # compare_digest avoids leaking key prefixes through early-exit timing.
+    # Compared as bytes: the str overload raises TypeError on non-ASCII
+    # input, which must read as an invalid key, not a 500
+    key_bytes = api_key.encode()
+    if not any(hmac.compare_digest(key_bytes, valid) for valid in settings.api_keys_bytes):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid API key"
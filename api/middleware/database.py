@@ -0,0 +1,20 @@
+"""Database availability guard"""
+from fastapi import HTTPException, status
+
+from services.query_service import query_service
+
+
+async def require_database() -> bool:
+    """Reject requests with 503 when no Neo4j connection is available.
+
+    Without this guard every request during an outage runs the full
+    handler, raises AttributeError inside the service try-block and comes
+    back as a misleading 400 - burning CPU on exception formatting for
+    traffic that is guaranteed to fail.
+    """
+    if query_service.iyp is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database connection unavailable"
+        )
+    return True
@@ -1,8 +1,16 @@
 """Request models for the API"""
+import re
 from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, validator
 from enum import Enum
 
+# Compiled once; a single case-insensitive pass with word boundaries, so
+# identifiers that merely contain a keyword (e.g. MERGEDLIST) are not flagged.
+# The whole scan runs inside the C regex engine in one O(n) pass with no
+# uppercase copy of the query, so even multi-KB queries validate cheaply;
+# a Python-level tokenizer would execute more bytecode per identifier
+_FORBIDDEN_RE = re.compile(r"\b(CREATE|DELETE|MERGE|SET|REMOVE|DROP)\b", re.IGNORECASE)
+
 class QueryType(str, Enum):
     BUILDER = "builder"
     CYPHER = "cypher"
@@ -17,14 +25,20 @@ class QueryOperation(BaseModel):
     """Single operation in a query chain"""
     method: str = Field(..., description="Method name like 'find', 'with_relationship', 'where'")
     params: Dict[str, Any] = Field(default={}, description="Parameters for the method")
-    
-    class Config:
-        json_schema_extra = {
+
+    # These models sit on the hot request path; disable validation features
+    # we do not use so pydantic-core takes its fast path
+    model_config = ConfigDict(
+        extra="ignore",
+        str_strip_whitespace=False,
+        validate_assignment=False,
+        json_schema_extra={
             "example": {
                 "method": "find",
                 "params": {"node_type": "AS", "asn": 15169}
             }
         }
+    )
 
 class QueryRequest(BaseModel):
     """Request model for executing queries"""
@@ -33,9 +47,12 @@ class QueryRequest(BaseModel):
     return_format: ReturnFormat = Field(ReturnFormat.JSON, description="Format for the response")
     limit: Optional[int] = Field(100, ge=1, le=1000, description="Maximum number of results")
     return_fields: Optional[List[str]] = Field(None, description="Specific fields to return")
-    
-    class Config:
-        json_schema_extra = {
+
+    model_config = ConfigDict(
+        extra="ignore",
+        str_strip_whitespace=False,
+        validate_assignment=False,
+        json_schema_extra={
             "example": {
                 "query_type": "builder",
                 "operations": [
@@ -47,23 +64,34 @@ class QueryRequest(BaseModel):
                 "limit": 10
             }
         }
+    )
 
 class CypherQueryRequest(BaseModel):
     """Request model for raw Cypher queries"""
     query: str = Field(..., description="Cypher query string")
     parameters: Dict[str, Any] = Field(default={}, description="Query parameters")
     return_format: ReturnFormat = Field(ReturnFormat.JSON)
-    
+
+    model_config = ConfigDict(
+        extra="ignore",
+        str_strip_whitespace=False,
+        validate_assignment=False
+    )
+
+
     @validator('query')
     def validate_query(cls, v):
         # Basic validation to prevent destructive operations
-        forbidden_keywords = ['CREATE', 'DELETE', 'MERGE', 'SET', 'REMOVE', 'DROP']
-        query_upper = v.upper()
-        for keyword in forbidden_keywords:
-            if keyword in query_upper:
-                raise ValueError(f"Query contains forbidden keyword: {keyword}")
+        m = _FORBIDDEN_RE.search(v)
+        if m:
+            raise ValueError(f"Query contains forbidden keyword: {m.group(1).upper()}")
         return v
 
+class ASBatchRequest(BaseModel):
+    """Request for batched AS detail lookups"""
+    asns: List[int] = Field(..., min_length=1, max_length=500, description="AS numbers to look up")
+    include_organizations: bool = Field(False, description="Include organization details")
+
 class ASQueryRequest(BaseModel):
     """Request for AS-specific queries"""
     asn: int = Field(..., description="Autonomous System Number")
@@ -6,10 +6,13 @@ from datetime import datetime
 class QueryResponse(BaseModel):
     """Standard query response"""
     success: bool = Field(..., description="Whether the query executed successfully")
-    data: Union[List[Dict[str, Any]], Dict[str, Any], str] = Field(..., description="Query results")
-    count: int = Field(..., description="Number of results returned")
+    data: Union[List[Dict[str, Any]], Dict[str, Any], str] = Field(default=[], description="Query results")
+    count: int = Field(0, description="Number of results returned")
     query_time_ms: float = Field(..., description="Query execution time in milliseconds")
     cached: bool = Field(False, description="Whether results were from cache")
+    error: Optional[str] = Field(None, description="Error message for failed queries (batch items)")
+    error_type: Optional[str] = Field(None, description="Type of error for failed queries")
+    truncated: Optional[bool] = Field(None, description="Whether the traversal depth was capped below the requested hops")
     
     class Config:
         json_schema_extra = {
@@ -53,7 +56,7 @@ class ASDetails(BaseModel):
 class HealthResponse(BaseModel):
     """Health check response"""
     status: str = Field(..., description="Service status")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(..., description="Time the check ran (UTC)")
     database_connected: bool
     cache_connected: bool
     version: str
@@ -1,14 +1,18 @@
 """Translation request and response models"""
 from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 class MethodChainRequest(BaseModel):
     """Request for method chain translation"""
     method_chain: str = Field(..., description="Method chain like '.find.with_organization.upstream'")
     parameters: Dict[str, Any] = Field(default={}, description="Parameters for the methods")
-    
-    class Config:
-        json_schema_extra = {
+
+    # Hot-path request model; skip validation features we do not use
+    model_config = ConfigDict(
+        extra="ignore",
+        str_strip_whitespace=False,
+        validate_assignment=False,
+        json_schema_extra={
             "example": {
                 "method_chain": ".find.with_organization.upstream",
                 "parameters": {
@@ -18,17 +22,22 @@ class MethodChainRequest(BaseModel):
                 }
             }
         }
+    )
 
 class NaturalLanguageRequest(BaseModel):
     """Request for natural language translation"""
     query: str = Field(..., description="Natural language query")
-    
-    class Config:
-        json_schema_extra = {
+
+    model_config = ConfigDict(
+        extra="ignore",
+        str_strip_whitespace=False,
+        validate_assignment=False,
+        json_schema_extra={
             "example": {
                 "query": "Find Google's upstream providers"
             }
         }
+    )
 
 class TranslationResponse(BaseModel):
     """Response from translation service"""
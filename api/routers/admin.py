@@ -1,23 +1,37 @@
 """Admin and health check endpoints"""
-from fastapi import APIRouter, Depends
-from datetime import datetime
+import asyncio
+import hashlib
+import json
+
+from fastapi import APIRouter, Depends, Request, Response
+from datetime import datetime, timezone
 from typing import Any, Dict
 import time
 
 from models.responses import HealthResponse, StatsResponse
 from services.query_service import query_service
+from middleware.auth import verify_api_key
 from config import settings
 
 router = APIRouter(prefix="/api/v1", tags=["Admin"])
 
-# Track some basic stats
+# Uptime reference; query counters live on the query service so every
+# finished query is recorded regardless of which router triggered it
 start_time = time.time()
-query_stats = {
-    "total": 0,
-    "successful": 0,
-    "failed": 0,
-    "total_time": 0
-}
+
+# Health probes can arrive every second; reuse the datetime object within
+# the same wall-clock second instead of constructing one per probe
+_last_ts_sec = 0
+_last_ts_dt = datetime.fromtimestamp(0, tz=timezone.utc)
+
+def _utc_now_cached() -> datetime:
+    """Current UTC time at one-second granularity"""
+    global _last_ts_sec, _last_ts_dt
+    now = int(time.time())
+    if now != _last_ts_sec:
+        _last_ts_dt = datetime.fromtimestamp(now, tz=timezone.utc)
+        _last_ts_sec = now
+    return _last_ts_dt
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check() -> Dict[str, Any]:
@@ -27,13 +41,14 @@ async def health_check() -> Dict[str, Any]:
     # Check database connection
     db_connected = query_service.iyp is not None
     
-    # Try to reconnect if disconnected
+    # Try to reconnect if disconnected; the connect is blocking network IO,
+    # so keep it off the event loop
     if not db_connected:
-        db_connected = query_service.connect_to_database()
+        db_connected = await asyncio.to_thread(query_service.connect_to_database)
     
     return {
         "status": "healthy" if db_connected else "degraded",
-        "timestamp": datetime.utcnow(),
+        "timestamp": _utc_now_cached(),
         "database_connected": db_connected,
         "cache_connected": False,  # Redis not implemented yet
         "version": settings.api_version
@@ -45,29 +60,41 @@ async def get_stats() -> Dict[str, Any]:
     Get API usage statistics
     """
     uptime = time.time() - start_time
-    avg_time = query_stats["total_time"] / max(query_stats["total"], 1)
-    
+    stats = query_service.get_query_stats()
+    cache_lookups = query_service.cache_hits + query_service.cache_misses
+
     return {
-        "total_queries": query_stats["total"],
-        "successful_queries": query_stats["successful"],
-        "failed_queries": query_stats["failed"],
-        "average_query_time_ms": avg_time,
-        "cache_hit_rate": 0.0,  # Not implemented yet
+        "total_queries": stats["total"],
+        "successful_queries": stats["successful"],
+        "failed_queries": stats["failed"],
+        "average_query_time_ms": stats["average_query_time_ms"],
+        "cache_hit_rate": query_service.cache_hits / max(cache_lookups, 1),
         "uptime_seconds": uptime
     }
 
-@router.get("/info")
-async def get_api_info() -> Dict[str, Any]:
+@router.post("/cache/clear")
+async def clear_query_cache(
+    authenticated: bool = Depends(verify_api_key)
+) -> Dict[str, Any]:
     """
-    Get API information and capabilities
+    Drop all cached query results
+
+    Call this after an IYP data refresh so cached AS details and query
+    results do not serve stale data for the remainder of their TTL.
     """
-    return {
+    query_service.clear_cache()
+    return {"success": True}
+
+# The /info payload is entirely static (endpoint paths and settings
+# snapshots), so serialize it once at import instead of per request
+_INFO_BYTES = json.dumps({
         "title": settings.api_title,
         "version": settings.api_version,
         "description": settings.api_description,
         "endpoints": {
             "query": {
                 "builder": "/api/v1/query/execute",
+                "batch": "/api/v1/query/execute/batch",
                 "cypher": "/api/v1/query/cypher",
                 "validate": "/api/v1/query/validate"
             },
@@ -91,4 +118,16 @@ async def get_api_info() -> Dict[str, Any]:
             "caching": settings.cache_enabled,
             "max_query_limit": settings.max_query_limit
         }
-    }
\ No newline at end of file
+}).encode()
+_INFO_ETAG = f'"{hashlib.blake2b(_INFO_BYTES, digest_size=8).hexdigest()}"'
+_INFO_HEADERS = {"ETag": _INFO_ETAG, "Cache-Control": "public, max-age=300"}
+
+@router.get("/info")
+async def get_api_info(request: Request) -> Response:
+    """
+    Get API information and capabilities
+    """
+    # Polling clients revalidate with If-None-Match and get a bodiless 304
+    if request.headers.get("if-none-match") == _INFO_ETAG:
+        return Response(status_code=304, headers=_INFO_HEADERS)
+    return Response(content=_INFO_BYTES, media_type="application/json", headers=_INFO_HEADERS)
\ No newline at end of file
@@ -1,25 +1,34 @@
 """Query endpoints router"""
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import Any, Dict
+import asyncio
+
+import orjson
+from fastapi import APIRouter, Body, Depends, HTTPException, Query as FastAPIQuery, status
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, List
 
 from models.requests import QueryRequest, CypherQueryRequest
 from models.responses import QueryResponse, ErrorResponse, CypherValidationResponse
-from services.query_service import query_service
+from services.query_service import _neo4j_default, query_service
 from middleware.auth import verify_api_key
+from middleware.database import require_database
 
 router = APIRouter(prefix="/api/v1/query", tags=["Query"])
 
 @router.post("/execute", response_model=QueryResponse)
 async def execute_query(
     request: QueryRequest,
-    authenticated: bool = Depends(verify_api_key)
+    authenticated: bool = Depends(verify_api_key),
+    db_available: bool = Depends(require_database)
 ) -> Dict[str, Any]:
     """
     Execute a query using the builder pattern
     
     This endpoint allows you to chain multiple operations to build complex queries.
     """
-    result = query_service.execute_builder_query(
+    # The iyp driver is synchronous; run it off the event loop so one slow
+    # query does not serialize every other in-flight request
+    result = await asyncio.to_thread(
+        query_service.execute_builder_query,
         operations=request.operations,
         return_format=request.return_format,
         limit=request.limit,
@@ -34,14 +43,51 @@ async def execute_query(
     
     return result
 
+@router.post("/execute/batch", response_model=List[QueryResponse])
+async def execute_query_batch(
+    requests: List[QueryRequest] = Body(..., min_length=1, max_length=50),
+    authenticated: bool = Depends(verify_api_key),
+    db_available: bool = Depends(require_database)
+) -> List[Dict[str, Any]]:
+    """
+    Execute several builder queries in a single request
+
+    Results are returned in the same order as the submitted queries. A failed
+    query does not abort the batch - its entry carries success=False along
+    with the error message.
+    """
+    return await asyncio.to_thread(query_service.execute_builder_queries_batch, requests)
+
+def _stream_query_response(result: Dict[str, Any]):
+    """Yield a QueryResponse-shaped JSON body record by record.
+
+    Serializing per record keeps peak memory at one record's worth of
+    JSON instead of a second payload-sized buffer next to the data list.
+    """
+    yield b'{"success":true,"data":['
+    first = True
+    for record in result["data"]:
+        if first:
+            first = False
+        else:
+            yield b","
+        # The temporal fallback matters here: by the time a record fails
+        # to encode, the 200 status and part of the body are already on
+        # the wire, so an encoder error would truncate the JSON mid-stream
+        yield orjson.dumps(record, default=_neo4j_default)
+    tail = f'],"count":{result["count"]},"query_time_ms":{result["query_time_ms"]},"cached":false}}'
+    yield tail.encode()
+
 @router.post("/cypher", response_model=QueryResponse)
 async def execute_cypher(
     request: CypherQueryRequest,
-    authenticated: bool = Depends(verify_api_key)
+    stream: bool = FastAPIQuery(False, description="Stream the JSON body record by record"),
+    authenticated: bool = Depends(verify_api_key),
+    db_available: bool = Depends(require_database)
 ) -> Dict[str, Any]:
     """
     Execute a raw Cypher query
-    
+
     Note: Only read operations are allowed. Write operations will be rejected.
     """
     # Validate the query first
@@ -52,7 +98,8 @@ async def execute_cypher(
             detail=f"Invalid query: {', '.join(validation['errors'])}"
         )
     
-    result = query_service.execute_cypher_query(
+    result = await asyncio.to_thread(
+        query_service.execute_cypher_query,
         query=request.query,
         parameters=request.parameters,
         return_format=request.return_format
@@ -63,7 +110,10 @@ async def execute_cypher(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=result["error"]
         )
-    
+
+    if stream and isinstance(result["data"], list):
+        return StreamingResponse(_stream_query_response(result), media_type="application/json")
+
     return result
 
 @router.post("/validate", response_model=CypherValidationResponse)
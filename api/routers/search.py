@@ -1,17 +1,47 @@
 """High-level search endpoints router"""
-from fastapi import APIRouter, Depends, HTTPException, Query as FastAPIQuery, status
-from typing import Any, Dict, Optional
+import asyncio
 
-from models.requests import ASQueryRequest, CountryQueryRequest
+from fastapi import APIRouter, Depends, HTTPException, Path, Query as FastAPIQuery, status
+from typing import Annotated, Any, Dict, Optional
+
+from models.requests import ASBatchRequest, ASQueryRequest, CountryQueryRequest
 from models.responses import QueryResponse, ASDetails
 from services.query_service import query_service
+from services.response_cache import response_cache
+from services.singleflight import SingleFlight
 from middleware.auth import verify_api_key
+from middleware.database import require_database
+
+# Every endpoint here hits Neo4j, so the availability guard applies
+# router-wide and outages short-circuit with 503 before any handler runs
+router = APIRouter(prefix="/api/v1", tags=["Search"], dependencies=[Depends(require_database)])
+
+# Declaring constraints on the path/query params lets pydantic-core reject
+# bad input before the handler coroutine is even scheduled, instead of
+# validating by hand inside the handler body
+ASNPath = Annotated[int, Path(ge=0, le=4_294_967_295, description="Autonomous System Number")]
+CountryCodePath = Annotated[str, Path(pattern=r"^[A-Za-z]{2}$", description="ISO 3166-1 alpha-2 country code")]
+
+# Coalesces concurrent identical lookups so a cold-cache stampede on one
+# ASN issues a single Neo4j query instead of one per request
+_flight = SingleFlight()
+
+# Redis calls block, so they run off the event loop - but only when the
+# cache is actually enabled (it is off by default); a disabled cache must
+# not cost two thread-pool hops per request for guaranteed no-ops
+async def _cache_get(cache_key: str):
+    if not response_cache.enabled:
+        return None
+    return await asyncio.to_thread(response_cache.get, cache_key)
 
-router = APIRouter(prefix="/api/v1", tags=["Search"])
+async def _cache_put(cache_key: str, payload: dict, ttl: int = None):
+    if not response_cache.enabled:
+        return
+    await asyncio.to_thread(response_cache.put, cache_key, payload, ttl)
 
 @router.get("/as/{asn}", response_model=QueryResponse)
 async def get_as_details(
-    asn: int,
+    asn: ASNPath,
     include_organizations: bool = FastAPIQuery(False, description="Include organization details"),
     include_peers: bool = FastAPIQuery(False, description="Include peering relationships"),
     authenticated: bool = Depends(verify_api_key)
@@ -19,42 +49,123 @@ async def get_as_details(
     """
     Get details for a specific Autonomous System
     """
-    result = query_service.get_as_details(
-        asn=asn,
+    cache_key = response_cache.key(
+        f"/as/{asn}",
         include_organizations=include_organizations,
         include_peers=include_peers
     )
-    
+    cached = await _cache_get(cache_key)
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    # Blocking Neo4j work runs off the event loop so concurrent lookups
+    # overlap instead of serializing on one thread; identical concurrent
+    # lookups share one query via the singleflight map
+    result = await _flight.run(
+        ("as_details", asn, include_organizations, include_peers),
+        lambda: asyncio.to_thread(
+            query_service.get_as_details,
+            asn=asn,
+            include_organizations=include_organizations,
+            include_peers=include_peers
+        )
+    )
+
     if not result["success"]:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"AS{asn} not found"
         )
-    
+
+    await _cache_put(cache_key, result)
+    return result
+
+@router.get("/as/{asn}/full", response_model=QueryResponse)
+async def get_as_full(
+    asn: ASNPath,
+    authenticated: bool = Depends(verify_api_key)
+) -> Dict[str, Any]:
+    """
+    Get an AS with its organizations, peers and upstream providers
+
+    Aggregates what would otherwise be separate detail/peers/upstream
+    calls into one Neo4j round trip.
+    """
+    cache_key = response_cache.key(f"/as/{asn}/full")
+    cached = await _cache_get(cache_key)
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    result = await _flight.run(
+        ("as_full", asn),
+        lambda: asyncio.to_thread(query_service.get_as_full, asn)
+    )
+
+    if not result["success"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=result["error"]
+        )
+
+    await _cache_put(cache_key, result)
+    return result
+
+@router.post("/as/batch", response_model=QueryResponse)
+async def get_as_details_batch(
+    request: ASBatchRequest,
+    authenticated: bool = Depends(verify_api_key)
+) -> Dict[str, Any]:
+    """
+    Get details for up to 500 ASes in one request
+
+    Collapses N individual /as/{asn} lookups into a single Neo4j round
+    trip. Results are returned as a mapping keyed by ASN.
+    """
+    result = await asyncio.to_thread(
+        query_service.get_as_details_batch,
+        request.asns,
+        request.include_organizations
+    )
+
+    if not result["success"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=result["error"]
+        )
+
     return result
 
 @router.get("/as/{asn}/upstream", response_model=QueryResponse)
 async def get_upstream_providers(
-    asn: int,
+    asn: ASNPath,
     max_hops: int = FastAPIQuery(1, ge=1, le=3, description="Maximum hops to traverse"),
     authenticated: bool = Depends(verify_api_key)
 ) -> Dict[str, Any]:
     """
     Get upstream providers for an AS
     """
-    result = query_service.find_upstream_providers(asn=asn, max_hops=max_hops)
-    
+    cache_key = response_cache.key(f"/as/{asn}/upstream", max_hops=max_hops)
+    cached = await _cache_get(cache_key)
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    result = await _flight.run(
+        ("as_upstream", asn, max_hops),
+        lambda: asyncio.to_thread(query_service.find_upstream_providers, asn=asn, max_hops=max_hops)
+    )
+
     if not result["success"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=result["error"]
         )
-    
+
+    await _cache_put(cache_key, result)
     return result
 
 @router.get("/as/{asn}/downstream", response_model=QueryResponse)
 async def get_downstream_customers(
-    asn: int,
+    asn: ASNPath,
     max_hops: int = FastAPIQuery(1, ge=1, le=3, description="Maximum hops to traverse"),
     authenticated: bool = Depends(verify_api_key)
 ) -> Dict[str, Any]:
@@ -73,13 +184,18 @@ async def get_downstream_customers(
 
 @router.get("/as/{asn}/peers", response_model=QueryResponse)
 async def get_as_peers(
-    asn: int,
+    asn: ASNPath,
     limit: int = FastAPIQuery(100, ge=1, le=1000),
     authenticated: bool = Depends(verify_api_key)
 ) -> Dict[str, Any]:
     """
     Get peering partners for an AS
     """
+    cache_key = response_cache.key(f"/as/{asn}/peers", limit=limit)
+    cached = await _cache_get(cache_key)
+    if cached is not None:
+        return {**cached, "cached": True}
+
     operations = [
         {"method": "find", "params": {"node_type": "AS", "asn": asn, "alias": "source"}},
         {"method": "with_relationship", "params": {"rel_type": "PEERS_WITH", "to": "AS", "alias": "peer"}},
@@ -87,19 +203,20 @@ async def get_as_peers(
         {"method": "return_fields", "params": {"fields": ["peer.asn", "peer.name"]}}
     ]
     
-    result = query_service.execute_builder_query(operations)
-    
+    result = await asyncio.to_thread(query_service.execute_builder_query, operations)
+
     if not result["success"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=result["error"]
         )
-    
+
+    await _cache_put(cache_key, result)
     return result
 
 @router.get("/country/{country_code}/as", response_model=QueryResponse)
 async def get_country_ases(
-    country_code: str,
+    country_code: CountryCodePath,
     limit: int = FastAPIQuery(100, ge=1, le=1000),
     include_organizations: bool = FastAPIQuery(False),
     authenticated: bool = Depends(verify_api_key)
@@ -107,69 +224,89 @@ async def get_country_ases(
     """
     Get all ASes in a specific country
     """
-    if len(country_code) != 2:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Country code must be 2 letters (ISO 3166-1 alpha-2)"
-        )
-    
-    result = query_service.find_as_by_country(
+    cache_key = response_cache.key(
+        f"/country/{country_code.upper()}/as",
+        limit=limit,
+        include_organizations=include_organizations
+    )
+    cached = await _cache_get(cache_key)
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    result = await asyncio.to_thread(
+        query_service.find_as_by_country,
         country_code=country_code.upper(),
         limit=limit
     )
-    
+
     if not result["success"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=result["error"]
         )
-    
+
+    await _cache_put(cache_key, result)
     return result
 
 @router.get("/search/as", response_model=QueryResponse)
 async def search_as(
     name: Optional[str] = FastAPIQuery(None, description="Search by AS name"),
-    country: Optional[str] = FastAPIQuery(None, description="Filter by country code"),
-    min_asn: Optional[int] = FastAPIQuery(None, description="Minimum ASN"),
-    max_asn: Optional[int] = FastAPIQuery(None, description="Maximum ASN"),
+    country: Optional[str] = FastAPIQuery(None, pattern=r"^[A-Za-z]{2}$", description="Filter by country code"),
+    min_asn: Optional[int] = FastAPIQuery(None, ge=0, le=4_294_967_295, description="Minimum ASN"),
+    max_asn: Optional[int] = FastAPIQuery(None, ge=0, le=4_294_967_295, description="Maximum ASN"),
     limit: int = FastAPIQuery(100, ge=1, le=1000),
     authenticated: bool = Depends(verify_api_key)
 ) -> Dict[str, Any]:
     """
     Search for ASes with various filters
     """
-    operations = [{"method": "find", "params": {"node_type": "AS", "alias": "as_node"}}]
-    
-    # Build where conditions
+    # User-filterable search gets a short TTL: still coalesces bursts of the
+    # same query without serving stale results for long
+    cache_key = response_cache.key(
+        "/search/as",
+        name=name, country=country, min_asn=min_asn, max_asn=max_asn, limit=limit
+    )
+    cached = await _cache_get(cache_key)
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    # All user input travels as Cypher parameters: the query text only
+    # varies with which filters are present, so Neo4j's plan cache is
+    # reused across calls and there is no injection surface
+    match_clause = "MATCH (as_node:AS)"
     conditions = []
+    parameters: Dict[str, Any] = {"limit": limit}
+
     if min_asn is not None:
-        conditions.append(f"as_node.asn >= {min_asn}")
+        conditions.append("as_node.asn >= $min_asn")
+        parameters["min_asn"] = min_asn
     if max_asn is not None:
-        conditions.append(f"as_node.asn <= {max_asn}")
-    
+        conditions.append("as_node.asn <= $max_asn")
+        parameters["max_asn"] = max_asn
     if country:
-        operations.append({
-            "method": "with_relationship",
-            "params": {"rel_type": "COUNTRY", "to": "Country", "alias": "country"}
-        })
-        conditions.append(f"country.country_code = '{country.upper()}'")
-    
+        match_clause += "-[:COUNTRY]->(country:Country)"
+        conditions.append("country.country_code = $country")
+        parameters["country"] = country.upper()
+    if name:
+        conditions.append("toLower(as_node.name) CONTAINS toLower($name)")
+        parameters["name"] = name
+
+    cypher = match_clause
     if conditions:
-        where_clause = " AND ".join(conditions)
-        operations.append({"method": "where_raw", "params": {"condition": where_clause}})
-    
-    operations.append({"method": "limit", "params": {"n": limit}})
-    operations.append({
-        "method": "return_fields",
-        "params": {"fields": ["as_node.asn", "as_node.name"]}
-    })
-    
-    result = query_service.execute_builder_query(operations)
-    
+        cypher += " WHERE " + " AND ".join(conditions)
+    cypher += " RETURN as_node.asn AS asn, as_node.name AS name LIMIT $limit"
+
+    result = await asyncio.to_thread(
+        query_service.execute_cypher_query,
+        query=cypher,
+        parameters=parameters
+    )
+
     if not result["success"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=result["error"]
         )
-    
+
+    await _cache_put(cache_key, result, 60)
     return result
\ No newline at end of file
@@ -1,10 +1,13 @@
 """Translation endpoints router"""
-from fastapi import APIRouter, Depends, HTTPException, status
+import hashlib
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from typing import Any, Dict
 
 from models.translation import (
-    MethodChainRequest, 
-    TranslationResponse, 
+    MethodChainRequest,
+    TranslationResponse,
     ExamplesResponse
 )
 from services.translation_service import translation_service
@@ -50,30 +53,34 @@ async def translate_method_chain(
     return result
 
 
-@router.get("/examples", response_model=ExamplesResponse)
+@router.get("/examples")
 async def get_translation_examples(
+    request: Request,
     authenticated: bool = Depends(verify_api_key)
-) -> Dict[str, Any]:
+) -> Response:
     """
     Get example translations showing common query patterns
-    
+
     Returns a collection of example method chains with their
     corresponding Cypher translations. Useful for understanding
     the translation patterns and learning the method chain syntax.
     """
-    return translation_service.get_common_examples()
+    # The canonical examples never change while the process lives; they are
+    # translated and serialized once at startup (see main.py) and served as
+    # pre-encoded bytes from then on
+    payload = getattr(request.app.state, "examples_bytes", None)
+    if payload is None:
+        payload = orjson.dumps(translation_service.get_common_examples())
+        # Mirror the service layer: keep only a fully successful build,
+        # so error translations from a down database are retried on the
+        # next hit instead of being pinned until restart
+        if translation_service.examples_ready():
+            request.app.state.examples_bytes = payload
+    return Response(content=payload, media_type="application/json")
 
-@router.get("/help")
-async def get_translation_help(
-    authenticated: bool = Depends(verify_api_key)
-) -> Dict[str, Any]:
-    """
-    Get help information for query translation
-    
-    Provides documentation on method chain syntax, available methods,
-    parameter options, and usage examples.
-    """
-    return {
+# The help payload is static documentation; build and serialize it once at
+# import instead of allocating the nested dict on every request
+_HELP_PAYLOAD = {
         "method_chain_syntax": {
             "format": ".method1.method2.method3",
             "description": "Chain methods with dots, starting with a dot",
@@ -147,4 +154,22 @@ async def get_translation_help(
             "Chain methods in logical order: find → relationships → filtering → output",
             "Test with /translate/examples to see working patterns"
         ]
-    }
\ No newline at end of file
+}
+_HELP_BYTES = orjson.dumps(_HELP_PAYLOAD)
+_HELP_ETAG = f'"{hashlib.blake2b(_HELP_BYTES, digest_size=8).hexdigest()}"'
+_HELP_HEADERS = {"ETag": _HELP_ETAG, "Cache-Control": "public, max-age=86400"}
+
+@router.get("/help")
+async def get_translation_help(
+    request: Request,
+    authenticated: bool = Depends(verify_api_key)
+) -> Response:
+    """
+    Get help information for query translation
+
+    Provides documentation on method chain syntax, available methods,
+    parameter options, and usage examples.
+    """
+    if request.headers.get("if-none-match") == _HELP_ETAG:
+        return Response(status_code=304, headers=_HELP_HEADERS)
+    return Response(content=_HELP_BYTES, media_type="application/json", headers=_HELP_HEADERS)
\ No newline at end of file
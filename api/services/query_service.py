@@ -1,30 +1,145 @@
 """Query execution service"""
 import sys
 import os
+import re
+import csv
+import io
 import time
 import json
+import hashlib
+import logging
+import threading
+from functools import lru_cache, wraps
 from typing import Any, Dict, List, Optional, Union
-import pandas as pd
 from datetime import datetime
 import neo4j.time
+import orjson
+from cachetools import LRUCache, TTLCache
 
-# Add parent directory to path to import iyp_query
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+# Make iyp_query importable when PYTHONPATH is not set; guarded so that
+# repeat imports under reloading workers do not grow sys.path and
+# invalidate the import-system caches each time
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
 from iyp_query import connect, Q, And, Or
+from iyp_query.builder import IYPQueryBuilder
 from config import settings
 from models.requests import QueryOperation, ReturnFormat
 
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=1)
+def _conn_params() -> tuple:
+    """Connection parameters resolved once per process"""
+    return (settings.neo4j_uri, settings.neo4j_user, settings.neo4j_password)
+
+# Allow-listed builder methods callable through the API. A frozen dispatch
+# table replaces per-operation hasattr/getattr walks and, more importantly,
+# stops request payloads from invoking arbitrary builder attributes
+_BUILDER_DISPATCH = {
+    name: getattr(IYPQueryBuilder, name)
+    for name in (
+        "find", "with_relationship", "where", "return_fields", "order_by",
+        "group_by", "having", "limit", "skip", "upstream", "downstream",
+        "peers", "with_organizations", "in_country", "categorized_as"
+    )
+}
+
+# One case-insensitive pass over the query; word boundaries avoid false
+# positives on identifiers that merely contain a keyword (e.g. CREATED)
+_FORBIDDEN_RE = re.compile(r"\b(CREATE|DELETE|MERGE|SET|REMOVE|DROP)\b", re.IGNORECASE)
+_MATCH_RE = re.compile(r"\bMATCH\b", re.IGNORECASE)
+_RETURN_RE = re.compile(r"\bRETURN\b", re.IGNORECASE)
+
+_NEO4J_TEMPORAL = (neo4j.time.Date, neo4j.time.Time, neo4j.time.Duration)
+
+def _neo4j_default(obj):
+    """orjson fallback encoder for Neo4j temporal types"""
+    if isinstance(obj, neo4j.time.DateTime):
+        return obj.iso_format()
+    if isinstance(obj, _NEO4J_TEMPORAL):
+        return str(obj)
+    raise TypeError
+
 def serialize_neo4j_types(obj):
-    """Convert Neo4j types to JSON-serializable types"""
+    """Convert Neo4j types to JSON-serializable types.
+
+    The common case (records with at most temporal values) is handled in
+    one C-level orjson round trip instead of a Python function call per
+    nested value; anything orjson cannot encode falls back to the
+    recursive walk.
+    """
+    try:
+        return orjson.loads(orjson.dumps(obj, default=_neo4j_default))
+    except TypeError:
+        return _serialize_neo4j_slow(obj)
+
+def _timed(fn):
+    """Standard success/error envelope around a query method.
+
+    The wrapped method returns its result data - or a (data, extras) tuple
+    to add fields such as ``truncated`` or override ``count`` - and this
+    wrapper supplies the timing, the envelope dict and the query counters
+    that were previously copy-pasted into every method.
+    """
+    @wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            data = fn(self, *args, **kwargs)
+        except Exception as e:
+            elapsed = (time.perf_counter_ns() - start) / 1e6
+            self._record_query(False, elapsed)
+            return {
+                "success": False,
+                "error": str(e),
+                "error_type": type(e).__name__,
+                "query_time_ms": elapsed
+            }
+
+        extras = None
+        if isinstance(data, tuple):
+            data, extras = data
+        if isinstance(data, list):
+            count = len(data)
+        elif isinstance(data, dict):
+            count = 1 if data else 0
+        else:
+            count = 1
+        elapsed = (time.perf_counter_ns() - start) / 1e6
+        self._record_query(True, elapsed)
+        result = {
+            "success": True,
+            "data": data,
+            "count": count,
+            "query_time_ms": elapsed,
+            "cached": False
+        }
+        if extras:
+            result.update(extras)
+        return result
+    return wrapper
+
+def _freeze(value):
+    """Hashable stand-in for a request parameter value (lists become tuples)"""
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+def _serialize_neo4j_slow(obj):
+    """Recursive fallback for structures orjson cannot encode directly"""
     if isinstance(obj, neo4j.time.DateTime):
         return obj.iso_format()
-    elif isinstance(obj, (neo4j.time.Date, neo4j.time.Time, neo4j.time.Duration)):
+    elif isinstance(obj, _NEO4J_TEMPORAL):
         return str(obj)
     elif isinstance(obj, dict):
-        return {k: serialize_neo4j_types(v) for k, v in obj.items()}
+        return {k: _serialize_neo4j_slow(v) for k, v in obj.items()}
     elif isinstance(obj, (list, tuple)):
-        return [serialize_neo4j_types(item) for item in obj]
+        return [_serialize_neo4j_slow(item) for item in obj]
     return obj
 
 class QueryService:
@@ -33,21 +148,161 @@ class QueryService:
     def __init__(self):
         """Initialize the query service with database connection"""
         self.iyp = None
+        # Read-aside result cache keyed on the fully-bound query text, so
+        # repeated identical reads skip the Neo4j round-trip entirely
+        self._cache = TTLCache(maxsize=settings.query_cache_size, ttl=settings.query_cache_ttl)
+        # AS details are hot (every endpoint variant funnels through them)
+        # and change only on IYP refresh cadence, so they get a larger,
+        # longer-lived cache of their own
+        self._as_details_cache = TTLCache(maxsize=10000, ttl=600)
+        # Compiled Cypher keyed by builder-chain shape: repeat shapes (the
+        # router-issued chains are all fixed shapes) skip the builder walk
+        self._cypher_cache = LRUCache(maxsize=512)
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Query counters live here (not in the admin router) so every code
+        # path that finishes a query records it, safely across worker threads
+        self._stats_lock = threading.Lock()
+        self.query_success = 0
+        self.query_failure = 0
+        self.query_time_total_ms = 0.0
         self.connect_to_database()
-    
+
+    def _record_query(self, success: bool, elapsed_ms: float):
+        """Record the outcome of a finished query"""
+        with self._stats_lock:
+            if success:
+                self.query_success += 1
+            else:
+                self.query_failure += 1
+            self.query_time_total_ms += elapsed_ms
+
+    def get_query_stats(self) -> Dict[str, Any]:
+        """Snapshot of query counters for the /stats endpoint"""
+        with self._stats_lock:
+            total = self.query_success + self.query_failure
+            return {
+                "total": total,
+                "successful": self.query_success,
+                "failed": self.query_failure,
+                "average_query_time_ms": self.query_time_total_ms / max(total, 1)
+            }
+
+    @staticmethod
+    def _cache_key(query: str, parameters: Optional[Dict[str, Any]], return_format) -> bytes:
+        """Build a compact cache key from the bound query text and format"""
+        payload = "|".join([
+            query.strip(),
+            json.dumps(parameters or {}, sort_keys=True, default=str),
+            str(return_format)
+        ])
+        return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
+    def _cache_get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Look up a cached result, tracking hit/miss counts"""
+        with self._cache_lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+        return result
+
+    def _cache_put(self, key: bytes, result: Dict[str, Any]):
+        """Store a successful result in the cache"""
+        with self._cache_lock:
+            self._cache[key] = result
+
+    # Properties the hot lookup endpoints filter on; without indexes these
+    # degrade to full label scans
+    _REQUIRED_INDEXES = (("AS", "asn"), ("Country", "country_code"))
+
     def connect_to_database(self):
         """Establish connection to Neo4j database"""
         try:
-            self.iyp = connect(
-                settings.neo4j_uri,
-                settings.neo4j_user,
-                settings.neo4j_password
-            )
+            self.iyp = connect(*_conn_params())
+            self._check_indexes()
             return True
         except Exception as e:
-            print(f"Failed to connect to database: {e}")
+            logger.exception("Failed to connect to Neo4j at %s", settings.neo4j_uri)
             return False
+
+    def _check_indexes(self):
+        """Warn (or create, if configured) missing lookup indexes"""
+        try:
+            rows = self.iyp.raw_query(
+                "SHOW INDEXES YIELD labelsOrTypes, properties "
+                "RETURN labelsOrTypes, properties"
+            )
+            present = set()
+            for row in rows:
+                for label in row.get("labelsOrTypes") or []:
+                    for prop in row.get("properties") or []:
+                        present.add((label, prop))
+        except Exception as e:
+            logger.warning("Could not inspect indexes: %s", e)
+            return
+
+        for label, prop in self._REQUIRED_INDEXES:
+            if (label, prop) in present:
+                continue
+            logger.warning("No index on :%s(%s); lookups will fall back to label scans", label, prop)
+            if settings.create_indexes:
+                try:
+                    self.iyp.raw_query(
+                        f"CREATE INDEX {label.lower()}_{prop} IF NOT EXISTS "
+                        f"FOR (n:{label}) ON (n.{prop})"
+                    )
+                    logger.info("Created index on :%s(%s)", label, prop)
+                except Exception as e:
+                    logger.warning("Could not create index on :%s(%s): %s", label, prop, e)
     
+    @staticmethod
+    def _op_fields(op):
+        """Method name and params of an operation, model- or dict-shaped.
+
+        Internal callers pass QueryOperation models, but some endpoints
+        build plain dicts; both spell the same {"method", "params"} shape.
+        """
+        if isinstance(op, dict):
+            return op["method"], op.get("params")
+        return op.method, op.params
+
+    @staticmethod
+    def _operation_signature(operations, limit, return_fields):
+        """Shape signature for a builder chain, plus its extracted literals.
+
+        Property filters on find() become Cypher parameters ($param_N), so
+        their values are left out of the signature and returned separately.
+        Everything else - method names, aliases, hops, limits, fields - is
+        baked into the Cypher text and therefore part of the shape.
+
+        Raises TypeError for unhashable parameter values; callers treat
+        that as "shape not cacheable".
+        """
+        signature = []
+        filter_values = []
+        for op in operations:
+            method, params = QueryService._op_fields(op)
+            params = params or {}
+            if method == "find":
+                shape = []
+                for key, value in params.items():
+                    if key in ("node_type", "alias"):
+                        shape.append((key, value))
+                    else:
+                        shape.append((key, None))
+                        filter_values.append(value)
+                signature.append(("find", tuple(shape)))
+            else:
+                signature.append(
+                    (method, tuple(sorted((k, _freeze(v)) for k, v in params.items())))
+                )
+        signature.append(("__limit__", limit))
+        signature.append(("__fields__", tuple(return_fields) if return_fields else None))
+        return tuple(signature), filter_values
+
     def execute_builder_query(
         self,
         operations: List[QueryOperation],
@@ -56,62 +311,116 @@ class QueryService:
         return_fields: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """Execute a builder-style query"""
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
+        # Builder chains with the same shape compile to the same Cypher
+        # text; only the find() property filters vary, and those travel as
+        # $param_N parameters. A shape hit skips the builder walk entirely
+        # and hands Neo4j one plan-cacheable query string.
+        # A malformed or unhashable operation just means "not cacheable";
+        # the builder walk below surfaces the real validation error inside
+        # the normal error envelope
         try:
-            # Start with the builder
-            query = self.iyp.builder()
-            
-            # Apply each operation in sequence
-            for op in operations:
-                method_name = op.method
-                params = op.params or {}
-                
-                # Get the method from the query object
-                if hasattr(query, method_name):
-                    method = getattr(query, method_name)
-                    query = method(**params)
-                else:
-                    raise ValueError(f"Unknown method: {method_name}")
-            
-            # Apply limit if specified
-            if limit:
-                query = query.limit(limit)
-            
-            # Apply return fields if specified
-            if return_fields:
-                query = query.return_fields(return_fields)
-            
-            # Execute based on return format
-            if return_format == ReturnFormat.DATAFRAME:
-                result = query.execute_df()
-                data = result.to_dict(orient='records')
+            shape_key, filter_values = self._operation_signature(operations, limit, return_fields)
+        except (TypeError, KeyError, AttributeError):
+            shape_key = filter_values = None
+
+        try:
+            cypher = None
+            if shape_key is not None:
+                with self._cache_lock:
+                    cypher = self._cypher_cache.get(shape_key)
+
+            if cypher is not None:
+                cypher_params = {f"param_{i}": v for i, v in enumerate(filter_values)}
             else:
-                result = query.execute()
-                data = result
+                # Start with the builder
+                query = self.iyp.builder()
+
+                # Apply each operation in sequence
+                for op in operations:
+                    method_name, op_params = self._op_fields(op)
+                    method = _BUILDER_DISPATCH.get(method_name)
+                    if method is None:
+                        raise ValueError(f"Unknown method: {method_name}")
+                    query = method(query, **(op_params or {}))
+
+                # Apply limit if specified
+                if limit:
+                    query = query.limit(limit)
+
+                # Apply return fields if specified
+                if return_fields:
+                    query = query.return_fields(return_fields)
+
+                cypher, cypher_params = query.to_cypher()
+                # Only cache shapes whose parameters are exactly the find()
+                # filters, in order: where()/having() conditions can mint
+                # extra parameters the signature does not model
+                if shape_key is not None and cypher_params == {
+                    f"param_{i}": v for i, v in enumerate(filter_values)
+                }:
+                    with self._cache_lock:
+                        self._cypher_cache[shape_key] = cypher
+
+            # Key the result cache on the translated Cypher so semantically
+            # equal builder chains share cache entries
+            cache_key = self._cache_key(cypher, cypher_params, return_format)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                self._record_query(True, (time.perf_counter_ns() - start_time) / 1e6)
+                return {**cached, "cached": True}
+
+            # The driver already yields row dicts, which is exactly what the
+            # DATAFRAME format's to_dict(orient='records') produced - so skip
+            # the pandas columnar round trip for every format
+            data = self.iyp.raw_query(cypher, cypher_params)
             
             # Serialize Neo4j types
             data = serialize_neo4j_types(data)
             
             # Calculate execution time
-            execution_time = (time.time() - start_time) * 1000
-            
-            return {
+            execution_time = (time.perf_counter_ns() - start_time) / 1e6
+
+            result = {
                 "success": True,
                 "data": data,
                 "count": len(data) if isinstance(data, list) else 1,
                 "query_time_ms": execution_time,
                 "cached": False
             }
-            
+            self._cache_put(cache_key, result)
+            self._record_query(True, execution_time)
+            return result
+
         except Exception as e:
+            elapsed = (time.perf_counter_ns() - start_time) / 1e6
+            self._record_query(False, elapsed)
             return {
                 "success": False,
                 "error": str(e),
                 "error_type": type(e).__name__,
-                "query_time_ms": (time.time() - start_time) * 1000
+                "query_time_ms": elapsed
             }
-    
+
+    def execute_builder_queries_batch(self, requests: List[Any]) -> List[Dict[str, Any]]:
+        """Execute several builder queries over the shared driver connection.
+
+        The bolt connection (and the result cache) is reused across the whole
+        batch, so callers pay HTTP/auth/framework overhead once instead of
+        once per query. Failures are reported per item rather than aborting
+        the batch.
+        """
+        return [
+            self.execute_builder_query(
+                operations=request.operations,
+                return_format=request.return_format,
+                limit=request.limit,
+                return_fields=request.return_fields
+            )
+            for request in requests
+        ]
+
     def execute_cypher_query(
         self,
         query: str,
@@ -119,163 +428,252 @@ class QueryService:
         return_format: ReturnFormat = ReturnFormat.JSON
     ) -> Dict[str, Any]:
         """Execute a raw Cypher query"""
-        start_time = time.time()
-        
+        start_time = time.perf_counter_ns()
+
+        cache_key = self._cache_key(query, parameters, return_format)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            self._record_query(True, (time.perf_counter_ns() - start_time) / 1e6)
+            return {**cached, "cached": True}
+
         try:
             # Execute the Cypher query
-            result = self.iyp.execute_cypher(query, parameters or {})
+            result = self.iyp.raw_query(query, parameters or {})
             
             # Format the result based on return format
-            if return_format == ReturnFormat.JSON:
-                data = list(result)
-            elif return_format == ReturnFormat.CSV:
-                df = pd.DataFrame(result)
-                data = df.to_csv(index=False)
+            if return_format == ReturnFormat.CSV:
+                # Stream rows through csv directly; a DataFrame would add a
+                # full columnar materialization plus dtype inference
+                rows = [dict(record) for record in result]
+                buf = io.StringIO()
+                if rows:
+                    writer = csv.DictWriter(buf, fieldnames=list(rows[0].keys()))
+                    writer.writeheader()
+                    writer.writerows(rows)
+                data = buf.getvalue()
             else:
-                df = pd.DataFrame(result)
-                data = df.to_dict(orient='records')
+                # JSON and DATAFRAME both serve record dicts; normalize
+                # Neo4j temporal values up front so response encoding (and
+                # the cache) only ever sees plain JSON types
+                data = serialize_neo4j_types(list(result))
             
-            execution_time = (time.time() - start_time) * 1000
-            
-            return {
+            execution_time = (time.perf_counter_ns() - start_time) / 1e6
+
+            result = {
                 "success": True,
                 "data": data,
                 "count": len(data) if isinstance(data, list) else 1,
                 "query_time_ms": execution_time,
                 "cached": False
             }
-            
+            self._cache_put(cache_key, result)
+            self._record_query(True, execution_time)
+            return result
+
         except Exception as e:
+            elapsed = (time.perf_counter_ns() - start_time) / 1e6
+            self._record_query(False, elapsed)
             return {
                 "success": False,
                 "error": str(e),
                 "error_type": type(e).__name__,
-                "query_time_ms": (time.time() - start_time) * 1000
+                "query_time_ms": elapsed
             }
-    
+
+    def clear_cache(self):
+        """Drop all cached results (called when IYP data refreshes)"""
+        with self._cache_lock:
+            self._cache.clear()
+            self._as_details_cache.clear()
+
     def get_as_details(self, asn: int, **kwargs) -> Dict[str, Any]:
         """Get details for a specific AS"""
-        start_time = time.time()
-        
+        start_time = time.perf_counter_ns()
+
+        cache_key = (
+            asn,
+            bool(kwargs.get('include_organizations')),
+            bool(kwargs.get('include_peers'))
+        )
+        with self._cache_lock:
+            cached = self._as_details_cache.get(cache_key)
+            if cached is not None:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+        if cached is not None:
+            return {**cached, "cached": True, "query_time_ms": (time.perf_counter_ns() - start_time) / 1e6}
+
         try:
-            query = self.iyp.builder().find('AS', asn=asn)
-            
+            query = self.iyp.builder().find('AS', alias='a', asn=asn)
+            fields = ['a.asn', 'a.name']
+
             # Add optional relationships
             if kwargs.get('include_organizations'):
-                query = query.with_organizations()
-            
+                query = query.with_organizations(alias='org')
+                fields.append('org.name')
+
             if kwargs.get('include_peers'):
                 query = query.with_relationship('PEERS_WITH', to='AS', alias='peer')
-            
-            result = query.execute()
-            
+                fields.extend(['peer.asn', 'peer.name'])
+
+            # Project only the scalars assembled below: returning whole nodes
+            # drags every property across the wire just to be discarded
+            result = query.return_fields(fields).execute()
+
             # Process and format the result
             as_details = {}
             if result:
                 first_result = result[0]
                 as_details = {
                     "asn": asn,
-                    "name": first_result.get('as', {}).get('name'),
-                    "country": first_result.get('country', {}).get('country_code') if 'country' in first_result else None,
-                    "organization": first_result.get('organization') if 'organization' in first_result else None
+                    "name": first_result.get('a.name'),
+                    # COUNTRY is not traversed by this query; the key is kept
+                    # for response-shape compatibility
+                    "country": None,
+                    "organization": {"name": first_result.get('org.name')}
+                                    if kwargs.get('include_organizations') else None
                 }
-            
+                if kwargs.get('include_peers'):
+                    as_details["peers"] = [
+                        {"asn": record.get('peer.asn'), "name": record.get('peer.name')}
+                        for record in result
+                    ]
+
             # Serialize Neo4j types
             as_details = serialize_neo4j_types(as_details)
             
-            execution_time = (time.time() - start_time) * 1000
-            
-            return {
+            execution_time = (time.perf_counter_ns() - start_time) / 1e6
+
+            result = {
                 "success": True,
                 "data": as_details,
                 "count": 1 if as_details else 0,
                 "query_time_ms": execution_time,
                 "cached": False
             }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "error_type": type(e).__name__,
-                "query_time_ms": (time.time() - start_time) * 1000
-            }
-    
-    def find_upstream_providers(self, asn: int, max_hops: int = 1) -> Dict[str, Any]:
-        """Find upstream providers for an AS"""
-        start_time = time.time()
-        
-        try:
-            providers = self.iyp.find_upstream_providers(asn=asn, max_hops=max_hops)
-            
-            execution_time = (time.time() - start_time) * 1000
-            
-            return {
-                "success": True,
-                "data": providers,
-                "count": len(providers),
-                "query_time_ms": execution_time,
-                "cached": False
-            }
-            
+            with self._cache_lock:
+                self._as_details_cache[cache_key] = result
+            return result
+
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e),
                 "error_type": type(e).__name__,
-                "query_time_ms": (time.time() - start_time) * 1000
+                "query_time_ms": (time.perf_counter_ns() - start_time) / 1e6
             }
+
+    @_timed
+    def get_as_full(self, asn: int) -> Dict[str, Any]:
+        """Get an AS plus its organizations, peers and upstreams at once.
+
+        One Cypher statement with staged OPTIONAL MATCH / collect replaces
+        the three separate endpoint calls a client would otherwise make,
+        so the whole profile costs a single network round trip and one
+        label-scan of the AS node.
+        """
+        query = (
+            "MATCH (a:AS {asn: $asn}) "
+            "OPTIONAL MATCH (a)-[:MANAGED_BY]->(o:Organization) "
+            "WITH a, collect(DISTINCT o.name) AS organizations "
+            "OPTIONAL MATCH (a)-[:PEERS_WITH]-(p:AS) "
+            "WITH a, organizations, collect(DISTINCT {asn: p.asn, name: p.name}) AS peers "
+            "OPTIONAL MATCH (a)-[:DEPENDS_ON]->(u:AS) "
+            "RETURN a.asn AS asn, a.name AS name, "
+            "[x IN organizations WHERE x IS NOT NULL] AS organizations, "
+            "[x IN peers WHERE x.asn IS NOT NULL] AS peers, "
+            "[x IN collect(DISTINCT {asn: u.asn, name: u.name}) WHERE x.asn IS NOT NULL] AS upstream"
+        )
+
+        records = self.iyp.raw_query(query, {"asn": asn})
+        return serialize_neo4j_types(dict(records[0])) if records else {}
+
+    @_timed
+    def get_as_details_batch(self, asns: List[int], include_organizations: bool = False) -> Dict[str, Any]:
+        """Get details for many ASes in one Neo4j round trip.
+
+        A single parameterized query with `asn IN $asns` replaces N
+        individual lookups, so the plan cache is reused across calls and
+        the client pays one network round trip regardless of batch size.
+        """
+        query = (
+            "MATCH (a:AS) WHERE a.asn IN $asns "
+            "OPTIONAL MATCH (a)-[:COUNTRY]->(c:Country) "
+        )
+        returns = "RETURN a.asn AS asn, a.name AS name, c.country_code AS country"
+        if include_organizations:
+            query += "OPTIONAL MATCH (a)-[:MANAGED_BY]->(o:Organization) "
+            returns += ", o.name AS organization"
+
+        records = self.iyp.raw_query(query + returns, {"asns": list(asns)})
+        data = {str(record["asn"]): serialize_neo4j_types(dict(record)) for record in records}
+        return data, {"count": len(data)}
+
+    # Out-degree thresholds for capping variable-length expansion: each
+    # extra hop on a dense node multiplies the path count, so well-connected
+    # ASes get shallower traversals
+    _DEGREE_HOP_CAPS = ((50, 3), (500, 2))
+
+    def _capped_hops(self, asn: int, max_hops: int) -> int:
+        """Cap traversal depth based on the AS's DEPENDS_ON out-degree"""
+        rows = self.iyp.raw_query(
+            "MATCH (a:AS {asn: $asn})-[:DEPENDS_ON]->() RETURN count(*) AS d",
+            {"asn": asn}
+        )
+        degree = rows[0]["d"] if rows else 0
+        for threshold, cap in self._DEGREE_HOP_CAPS:
+            if degree < threshold:
+                return min(max_hops, cap)
+        return 1
+
+    @_timed
+    def find_upstream_providers(self, asn: int, max_hops: int = 1, limit: int = 1000) -> Dict[str, Any]:
+        """Find upstream providers for an AS.
+
+        The traversal depth is capped by the AS's out-degree (a cheap
+        index-backed count) before the variable-length expansion runs, and
+        the expansion itself is bounded with DISTINCT + LIMIT, so dense
+        sub-graphs cannot blow up the executor.
+        """
+        hops = self._capped_hops(asn, max_hops)
+        # Variable-length bounds cannot be Cypher parameters; hops is a
+        # validated int in [1, 3] so inlining it is safe
+        providers = self.iyp.raw_query(
+            f"MATCH (a:AS {{asn: $asn}})-[:DEPENDS_ON*1..{hops}]->(u:AS) "
+            "RETURN DISTINCT u.asn AS asn, u.name AS name "
+            "LIMIT $limit",
+            {"asn": asn, "limit": limit}
+        )
+        return providers, {"truncated": hops < max_hops}
     
+    @_timed
     def find_as_by_country(self, country_code: str, limit: int = 100) -> Dict[str, Any]:
         """Find ASes in a specific country"""
-        start_time = time.time()
-        
-        try:
-            result = (self.iyp.builder()
-                     .find('AS', alias='as_node')
-                     .with_relationship('COUNTRY', to='Country', alias='country')
-                     .where(Q('country.country_code') == country_code.upper())
-                     .limit(limit)
-                     .return_fields(['as_node.asn', 'as_node.name', 'country.country_code'])
-                     .execute())
-            
-            execution_time = (time.time() - start_time) * 1000
-            
-            return {
-                "success": True,
-                "data": result,
-                "count": len(result),
-                "query_time_ms": execution_time,
-                "cached": False
-            }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "error_type": type(e).__name__,
-                "query_time_ms": (time.time() - start_time) * 1000
-            }
+        return (self.iyp.builder()
+                .find('AS', alias='as_node')
+                .with_relationship('COUNTRY', to='Country', alias='country')
+                .where(Q('country.country_code') == country_code.upper())
+                .limit(limit)
+                .return_fields(['as_node.asn', 'as_node.name', 'country.country_code'])
+                .execute())
     
     def validate_cypher_query(self, query: str) -> Dict[str, Any]:
         """Validate a Cypher query without executing it"""
         warnings = []
         errors = []
-        
+
         # Check for forbidden operations
-        forbidden_keywords = ['CREATE', 'DELETE', 'MERGE', 'SET', 'REMOVE', 'DROP']
-        query_upper = query.upper()
-        
-        for keyword in forbidden_keywords:
-            if keyword in query_upper:
-                errors.append(f"Query contains forbidden keyword: {keyword}")
-        
+        found = {m.group(1).upper() for m in _FORBIDDEN_RE.finditer(query)}
+        for keyword in sorted(found):
+            errors.append(f"Query contains forbidden keyword: {keyword}")
+
         # Check for MATCH clause
-        if 'MATCH' not in query_upper:
+        if not _MATCH_RE.search(query):
             warnings.append("Query does not contain a MATCH clause")
-        
+
         # Check for RETURN clause
-        if 'RETURN' not in query_upper:
+        if not _RETURN_RE.search(query):
             warnings.append("Query does not contain a RETURN clause")
         
         return {
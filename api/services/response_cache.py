@@ -0,0 +1,61 @@
+"""Redis-backed response caching for read-heavy endpoints"""
+import orjson
+
+try:
+    import redis
+except ImportError:  # Redis is optional; the cache simply stays disabled
+    redis = None
+
+from config import settings
+
+class ResponseCache:
+    """Best-effort response cache backed by Redis.
+
+    Lookup endpoints serve data that changes on IYP refresh cadence
+    (hours), so identical requests within the TTL can skip Neo4j
+    entirely. Every operation degrades to a miss when caching is
+    disabled or Redis is unreachable - endpoints never fail because
+    of the cache.
+    """
+
+    def __init__(self):
+        self._client = None
+        if settings.cache_enabled and settings.redis_url and redis is not None:
+            try:
+                self._client = redis.Redis.from_url(settings.redis_url, socket_timeout=0.5)
+                self._client.ping()
+            except Exception as e:
+                print(f"Warning: response cache disabled: {e}")
+                self._client = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._client is not None
+
+    @staticmethod
+    def key(path: str, **params) -> str:
+        """Build a stable cache key from the endpoint path and its inputs"""
+        query = "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+        return f"iyp:resp:{path}?{query}"
+
+    def get(self, key: str):
+        """Fetch a cached payload, or None on miss/error"""
+        if self._client is None:
+            return None
+        try:
+            raw = self._client.get(key)
+        except Exception:
+            return None
+        return orjson.loads(raw) if raw else None
+
+    def put(self, key: str, payload: dict, ttl: int = None):
+        """Store a payload with the configured (or given) TTL"""
+        if self._client is None:
+            return
+        try:
+            self._client.setex(key, ttl or settings.cache_ttl, orjson.dumps(payload))
+        except Exception:
+            pass
+
+# Singleton instance
+response_cache = ResponseCache()
@@ -2,23 +2,69 @@
 import sys
 import os
 import re
+import threading
 from typing import Any, Dict, List, Optional, Tuple
 import json
+from cachetools import LRUCache
 
-# Add parent directory to path to import iyp_query
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+# Make iyp_query importable when PYTHONPATH is not set; guarded so that
+# repeat imports under reloading workers do not grow sys.path and
+# invalidate the import-system caches each time
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
 from iyp_query import connect, Q, And, Or
 from config import settings
 
+# One pass over the Cypher text collects every token the explanation cares
+# about, replacing seven independent substring scans
+_EXPLAIN_RE = re.compile(
+    r"\b(?P<match>MATCH)\b"
+    r"|:(?P<as_label>AS)\b"
+    r"|:(?P<org_label>Organization)\b"
+    r"|:(?P<country_label>Country)\b"
+    r"|\b(?P<depends>DEPENDS_ON)\b"
+    r"|\b(?P<peers>PEERS_WITH)\b"
+    r"|\b(?P<managed>MANAGED_BY)\b"
+    r"|\b(?P<where>WHERE)\b"
+    r"|\b(?P<limit>LIMIT)\b"
+)
+
+_LABEL_EXPLANATIONS = (
+    ("as_label", "Finds Autonomous System nodes"),
+    ("org_label", "Includes organization information"),
+    ("country_label", "Includes country information"),
+)
+
+# Mirrors the original elif chain: only the first relationship found is
+# reported, in this priority order
+_REL_EXPLANATIONS = (
+    ("depends", "Follows provider-customer relationships"),
+    ("peers", "Follows peering relationships"),
+    ("managed", "Follows organization management relationships"),
+)
+
 class CypherTranslationService:
     """Service for translating queries to Cypher without executing them"""
     
     def __init__(self):
         """Initialize the translation service"""
         self.iyp = None
-        self._connect_to_database()
-    
+        # Translation is deterministic in (chain, parameters) and graph
+        # mutations never affect it, so hot chains are memoized for the
+        # lifetime of the process
+        self._translation_cache = LRUCache(maxsize=1024)
+        self._translation_lock = threading.Lock()
+        self.cache_hits = 0
+        # The canonical examples are constants; their translated form is
+        # frozen after the first fully successful build
+        self._examples_cache = None
+        # Connection is deferred to the first translation: connect() does a
+        # live round-trip to Neo4j, and paying that at module import slows
+        # every cold start (and every reloader restart) even for code paths
+        # that never translate anything
+
     def _connect_to_database(self):
         """Connect to database for query building (but not execution)"""
         try:
@@ -27,30 +73,52 @@ class CypherTranslationService:
                 settings.neo4j_user,
                 settings.neo4j_password
             )
+            # Memoized translations were produced by builders from the old
+            # connection; drop them so a reconnect starts clean
+            with self._translation_lock:
+                self._translation_cache.clear()
             return True
         except Exception as e:
             print(f"Warning: Database connection failed: {e}")
             return False
     
-    def translate_method_chain(self, method_chain: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+    def translate_method_chain(self, method_chain: str, params: Dict[str, Any] = None,
+                               include_explanation: bool = True) -> Dict[str, Any]:
         """
         Translate method chain like '.find.with_organization.upstream' to Cypher
         
         Args:
             method_chain: String like '.find.with_organization.upstream'
             params: Optional parameters like {'asn': 15169, 'hops': 2}
+            include_explanation: Skip the explanation scan of the generated
+                Cypher when the caller will not read it
         """
         try:
-            if not self.iyp:
+            if self.iyp is None:
+                self._connect_to_database()
+            if self.iyp is None:
                 return {
                     "success": False,
                     "error": "Database connection not available for query building",
                     "cypher": None,
                     "parameters": {}
                 }
-            
+
             params = params or {}
-            
+
+            # Check the memo first; unhashable parameter values (e.g. lists)
+            # simply skip caching
+            try:
+                cache_key = (method_chain, tuple(sorted(params.items())), include_explanation)
+            except TypeError:
+                cache_key = None
+            if cache_key is not None:
+                with self._translation_lock:
+                    cached = self._translation_cache.get(cache_key)
+                    if cached is not None:
+                        self.cache_hits += 1
+                        return dict(cached)
+
             # Clean and split the method chain
             chain = method_chain.strip()
             if chain.startswith('.'):
@@ -74,69 +142,18 @@ class CypherTranslationService:
             for method_name in methods:
                 method_params = self._get_method_params(method_name, params)
                 applied_methods.append(f"{method_name}({method_params})")
-                
+
+                handler = self._HANDLERS.get(method_name)
+                if handler is None:
+                    return {
+                        "success": False,
+                        "error": f"Unknown method: {method_name}",
+                        "cypher": None,
+                        "parameters": {}
+                    }
+
                 try:
-                    if hasattr(query, method_name):
-                        method = getattr(query, method_name)
-                        
-                        # Apply method with appropriate parameters
-                        if method_name == 'find':
-                            node_type = params.get('node_type', 'AS')
-                            asn = params.get('asn')
-                            alias = params.get('alias', 'node')
-                            
-                            if asn:
-                                query = method(node_type, alias=alias, asn=asn)
-                            else:
-                                query = method(node_type, alias=alias)
-                                
-                        elif method_name in ['with_organizations', 'with_organization']:
-                            query = query.with_organizations()
-                            
-                        elif method_name == 'upstream':
-                            hops = params.get('hops', 1)
-                            alias = params.get('upstream_alias', 'upstream')
-                            query = method(hops=hops, alias=alias)
-                            
-                        elif method_name == 'downstream':
-                            hops = params.get('hops', 1)
-                            alias = params.get('downstream_alias', 'downstream')
-                            query = method(hops=hops, alias=alias)
-                            
-                        elif method_name == 'peers':
-                            alias = params.get('peer_alias', 'peer')
-                            query = method(alias=alias)
-                            
-                        elif method_name == 'with_relationship':
-                            rel_type = params.get('relationship', 'DEPENDS_ON')
-                            to_type = params.get('to', 'AS')
-                            alias = params.get('rel_alias', 'related')
-                            query = method(rel_type, to=to_type, alias=alias)
-                            
-                        elif method_name == 'where':
-                            condition = params.get('condition')
-                            if condition:
-                                query = method(condition)
-                            
-                        elif method_name == 'limit':
-                            n = params.get('limit', 10)
-                            query = method(n)
-                            
-                        elif method_name == 'return_fields':
-                            fields = params.get('fields', ['*'])
-                            query = method(fields)
-                            
-                        else:
-                            # Try to call method with no parameters
-                            query = method()
-                    else:
-                        return {
-                            "success": False,
-                            "error": f"Unknown method: {method_name}",
-                            "cypher": None,
-                            "parameters": {}
-                        }
-                        
+                    query = handler(query, params)
                 except Exception as e:
                     return {
                         "success": False,
@@ -148,15 +165,19 @@ class CypherTranslationService:
             # Generate Cypher query
             try:
                 cypher, cypher_params = query.to_cypher()
-                
-                return {
+
+                result = {
                     "success": True,
                     "method_chain": " → ".join(applied_methods),
                     "cypher": cypher,
                     "parameters": cypher_params,
-                    "explanation": self._explain_cypher(cypher)
+                    "explanation": self._explain_cypher(cypher) if include_explanation else None
                 }
-                
+                if cache_key is not None:
+                    with self._translation_lock:
+                        self._translation_cache[cache_key] = result
+                return dict(result)
+
             except Exception as e:
                 return {
                     "success": False,
@@ -173,6 +194,71 @@ class CypherTranslationService:
                 "parameters": {}
             }
     
+    # --- Method-chain handlers -------------------------------------------
+    # One hash lookup per chained method replaces the hasattr probe plus a
+    # ten-branch if/elif cascade; each handler pulls its own defaults from
+    # the request parameters
+
+    @staticmethod
+    def _h_find(query, params):
+        node_type = params.get('node_type', 'AS')
+        alias = params.get('alias', 'node')
+        asn = params.get('asn')
+        if asn:
+            return query.find(node_type, alias=alias, asn=asn)
+        return query.find(node_type, alias=alias)
+
+    @staticmethod
+    def _h_with_organizations(query, params):
+        return query.with_organizations()
+
+    @staticmethod
+    def _h_upstream(query, params):
+        return query.upstream(hops=params.get('hops', 1), alias=params.get('upstream_alias', 'upstream'))
+
+    @staticmethod
+    def _h_downstream(query, params):
+        return query.downstream(hops=params.get('hops', 1), alias=params.get('downstream_alias', 'downstream'))
+
+    @staticmethod
+    def _h_peers(query, params):
+        return query.peers(alias=params.get('peer_alias', 'peer'))
+
+    @staticmethod
+    def _h_with_relationship(query, params):
+        return query.with_relationship(
+            params.get('relationship', 'DEPENDS_ON'),
+            to=params.get('to', 'AS'),
+            alias=params.get('rel_alias', 'related')
+        )
+
+    @staticmethod
+    def _h_where(query, params):
+        condition = params.get('condition')
+        return query.where(condition) if condition else query
+
+    @staticmethod
+    def _h_limit(query, params):
+        return query.limit(params.get('limit', 10))
+
+    @staticmethod
+    def _h_return_fields(query, params):
+        return query.return_fields(params.get('fields', ['*']))
+
+    # 'with_organization' kept as an alias for backwards compatibility
+    _HANDLERS = {
+        'find': _h_find,
+        'with_organizations': _h_with_organizations,
+        'with_organization': _h_with_organizations,
+        'upstream': _h_upstream,
+        'downstream': _h_downstream,
+        'peers': _h_peers,
+        'with_relationship': _h_with_relationship,
+        'where': _h_where,
+        'limit': _h_limit,
+        'return_fields': _h_return_fields,
+    }
+
     def _get_method_params(self, method_name: str, params: Dict[str, Any]) -> str:
         """Get parameter description for method"""
         if method_name == 'find':
@@ -195,72 +281,86 @@ class CypherTranslationService:
     
     def _explain_cypher(self, cypher: str) -> str:
         """Generate human-readable explanation of Cypher query"""
+        seen = {m.lastgroup for m in _EXPLAIN_RE.finditer(cypher)}
         explanations = []
-        
-        if 'MATCH' in cypher:
-            if ':AS' in cypher:
-                explanations.append("Finds Autonomous System nodes")
-            if ':Organization' in cypher:
-                explanations.append("Includes organization information")
-            if ':Country' in cypher:
-                explanations.append("Includes country information")
-        
-        if 'DEPENDS_ON' in cypher:
-            explanations.append("Follows provider-customer relationships")
-        elif 'PEERS_WITH' in cypher:
-            explanations.append("Follows peering relationships")
-        elif 'MANAGED_BY' in cypher:
-            explanations.append("Follows organization management relationships")
-        
-        if 'WHERE' in cypher:
+
+        if "match" in seen:
+            for group, text in _LABEL_EXPLANATIONS:
+                if group in seen:
+                    explanations.append(text)
+
+        for group, text in _REL_EXPLANATIONS:
+            if group in seen:
+                explanations.append(text)
+                break
+
+        if "where" in seen:
             explanations.append("Applies filtering conditions")
-        
-        if 'LIMIT' in cypher:
+
+        if "limit" in seen:
             explanations.append("Limits the number of results")
-        
+
         return "; ".join(explanations) if explanations else "Basic graph query"
     
+    # Fixed inputs for get_common_examples; translations of these are
+    # deterministic, so the combined payload is built once
+    _COMMON_EXAMPLES = (
+        {
+            "name": "Find AS with organization",
+            "method_chain": ".find.with_organizations",  # Fixed to use plural
+            "params": {"asn": 15169},
+            "description": "Get AS details including managing organization"
+        },
+        {
+            "name": "Find upstream providers",
+            "method_chain": ".find.upstream",
+            "params": {"asn": 216139, "hops": 2},
+            "description": "Get upstream providers up to 2 hops away"
+        },
+        {
+            "name": "Find AS peers",
+            "method_chain": ".find.peers",
+            "params": {"asn": 15169},
+            "description": "Get direct peering partners"
+        },
+        {
+            "name": "Complex relationship query",
+            "method_chain": ".find.with_relationship.limit",
+            "params": {"asn": 15169, "relationship": "COUNTRY", "to": "Country", "limit": 5},
+            "description": "Find AS with specific relationship type"
+        }
+    )
+
     def get_common_examples(self) -> Dict[str, Any]:
         """Get common query examples with their translations"""
-        examples = [
-            {
-                "name": "Find AS with organization", 
-                "method_chain": ".find.with_organizations",  # Fixed to use plural
-                "params": {"asn": 15169},
-                "description": "Get AS details including managing organization"
-            },
-            {
-                "name": "Find upstream providers",
-                "method_chain": ".find.upstream",
-                "params": {"asn": 216139, "hops": 2},
-                "description": "Get upstream providers up to 2 hops away"
-            },
-            {
-                "name": "Find AS peers",
-                "method_chain": ".find.peers",
-                "params": {"asn": 15169},
-                "description": "Get direct peering partners"
-            },
-            {
-                "name": "Complex relationship query",
-                "method_chain": ".find.with_relationship.limit",
-                "params": {"asn": 15169, "relationship": "COUNTRY", "to": "Country", "limit": 5},
-                "description": "Find AS with specific relationship type"
-            }
-        ]
-        
+        if self._examples_cache is not None:
+            return self._examples_cache
+
         results = []
-        for example in examples:
+        for example in self._COMMON_EXAMPLES:
             translation = self.translate_method_chain(
-                example["method_chain"], 
+                example["method_chain"],
                 example["params"]
             )
             results.append({
                 "example": example,
                 "translation": translation
             })
-        
-        return {"examples": results}
+
+        payload = {"examples": results}
+        # Freeze only a fully successful build: a failed startup connection
+        # produces error translations that should be retried, not cached
+        if all(r["translation"].get("success") for r in results):
+            self._examples_cache = payload
+        return payload
+
+    def examples_ready(self) -> bool:
+        """Whether the canonical examples have been frozen (fully successful).
+
+        Callers that pre-encode the payload should apply the same rule and
+        only keep encodings of a frozen build.
+        """
+        return self._examples_cache is not None
 
 # Singleton instance
 translation_service = CypherTranslationService()
\ No newline at end of file